@@ -72,4 +72,115 @@ def test_randomize_ships():
     state.randomize_ships('Alpha')
     assert len(state.ships_alpha) == len(SHIP_SHAPES)
     state.randomize_ships('Omega')
-    assert len(state.ships_omega) == len(SHIP_SHAPES) 
\ No newline at end of file
+    assert len(state.ships_omega) == len(SHIP_SHAPES) 
+
+def test_shot_uses_bitboard():
+    state = GameState()
+    state.add_ship('Alpha', [(0, i) for i in range(2)], (0, 0), 0)
+    assert state.process_shot('Omega', (0, 1), 'Player1') == 'HIT'
+    assert state.process_shot('Omega', (3, 3), 'Player1') == 'MISS'
+    assert state.process_shot('Omega', (3, 3), 'Player2') is None  # already fired
+    board = state.boards['Alpha']
+    assert board.hits and board.misses
+    assert board.shots == board.hits | board.misses
+    state.undo_shot()
+    assert state.process_shot('Omega', (3, 3), 'Player2') == 'MISS'
+
+def test_remove_ship_frees_cells():
+    state = GameState()
+    shape = [(0, i) for i in range(3)]
+    state.add_ship('Omega', shape, (4, 4), 1)
+    assert not state.can_place_ship('Omega', shape, (4, 4), 1)
+    assert state.remove_ship_at('Omega', (5, 4))
+    assert state.boards['Omega'].ships == 0
+    assert state.can_place_ship('Omega', shape, (4, 4), 1)
+
+def test_ship_index_tracks_sinking():
+    state = GameState()
+    shape = [(0, i) for i in range(2)]
+    state.add_ship('Alpha', shape, (1, 1), 0)
+    state.add_ship('Alpha', shape, (5, 5), 0)
+    ship = state.ship_at('Alpha', (1, 2))
+    assert ship is not None and ship.origin == (1, 1)
+    assert state.ship_at('Alpha', (0, 0)) is None
+    state.process_shot('Omega', (1, 1), 'Player1')
+    assert not state.is_ship_sunk('Alpha', (1, 1))
+    state.process_shot('Omega', (1, 2), 'Player1')
+    assert state.is_ship_sunk('Alpha', (1, 1))
+    assert state.afloat_coords('Alpha') == {(5, 5), (5, 6)}
+    state.undo_shot()
+    assert not state.is_ship_sunk('Alpha', (1, 1))
+    assert (1, 2) in state.afloat_coords('Alpha')
+
+def test_remove_ship_keeps_index_consistent():
+    state = GameState()
+    shape = [(0, i) for i in range(3)]
+    state.add_ship('Omega', shape, (0, 0), 0)
+    state.add_ship('Omega', shape, (2, 0), 0)
+    assert state.remove_ship('Omega', 0)
+    assert state.ship_at('Omega', (0, 1)) is None
+    assert state.ship_at('Omega', (2, 1)).origin == (2, 0)
+    assert state.ships_omega == [(shape, (2, 0), 0)]
+
+def test_multi_letter_coordinates():
+    from Battleship.wasteland_battleship_secretset import column_label, coord_from_text, coord_to_text
+    assert [column_label(x) for x in (0, 25, 26, 27, 63)] == ['A', 'Z', 'AA', 'AB', 'BL']
+    assert coord_from_text('b4') == (1, 3)
+    assert coord_from_text('AA12', 32) == (26, 11)
+    assert coord_from_text('AA12') is None  # off an 8x8 board
+    assert coord_from_text('ZZZ', 64) is None
+    assert coord_to_text((63, 63)) == 'BL64'
+
+def test_large_board():
+    state = GameState(grid_size=64)
+    assert len(state.fleet) == len(SHIP_SHAPES) * 64
+    state.add_ship('Alpha', SHIP_SHAPES[0][1], (63, 59), 0)
+    assert state.process_shot('Omega', (63, 63), 'Player1') == 'HIT'
+    assert state.process_shot('Omega', (0, 0), 'Player1') == 'MISS'
+    with pytest.raises(ValueError):
+        GameState(grid_size=65)
+
+def test_randomize_ships_full_fleet_on_big_boards():
+    import random
+    for size in (8, 26, 64):
+        state = GameState(grid_size=size)
+        state.randomize_ships('Alpha', rng=random.Random(size))
+        assert len(state.ships_alpha) == len(state.fleet)
+        cells = sum(len(shape) for shape, _, _ in state.ships_alpha)
+        assert state.boards['Alpha'].ships.bit_count() == cells  # no overlaps
+
+def test_randomizer_backtracks_on_dense_fleet():
+    import random
+    from Battleship.wasteland_battleship_bitboard import random_fleet
+    shapes = [[(0, i) for i in range(4)]] * 16  # tiles the whole 8x8 board
+    layout = random_fleet(shapes, 8, rng=random.Random(0))
+    occupied = 0
+    for mask, _, _ in layout:
+        assert not mask & occupied
+        occupied |= mask
+    assert occupied == (1 << 64) - 1
+
+def test_randomizer_raises_instead_of_dropping_ships():
+    from Battleship.wasteland_battleship_bitboard import FleetPlacementError, random_fleet
+    with pytest.raises(FleetPlacementError):
+        random_fleet([[(0, i) for i in range(4)]] * 17, 8)
+    with pytest.raises(FleetPlacementError):
+        random_fleet([[(0, i) for i in range(9)]], 8)
+    state = GameState()
+    state.randomize_ships('Alpha')
+    before = state.ships_alpha
+    state.fleet = SHIP_SHAPES * 4  # 68 cells on a 64-cell board
+    with pytest.raises(FleetPlacementError):
+        state.randomize_ships('Alpha')
+    assert state.ships_alpha == before
+
+def test_randomize_ship_keeps_rest_of_fleet():
+    import random
+    state = GameState()
+    state.randomize_ships('Omega', rng=random.Random(1))
+    before = state.ships_omega
+    state.randomize_ship('Omega', 2, rng=random.Random(2))
+    after = state.ships_omega
+    assert len(after) == len(SHIP_SHAPES)
+    assert after[:2] == before[:2] and after[3:] == before[3:]
+    assert after[2][0] == SHIP_SHAPES[2][1]
@@ -2,7 +2,7 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 import pytest
-from PyQt5 import QtWidgets, QtCore
+from PySide6 import QtWidgets, QtCore
 from Battleship.wasteland_battleship_secretset import GameState, ControlWindow, DisplayWindow
 
 def test_fire_button_updates_log(qtbot):
@@ -90,4 +90,40 @@ def test_chaos_user_rapid_toggle(qtbot):
     qtbot.addWidget(control)
     for _ in range(10):
         qtbot.mouseClick(control.gm_vs_players_btn, QtCore.Qt.LeftButton)
-    assert control.gm_vs_players_btn.isChecked() in [True, False] 
\ No newline at end of file
+    assert control.gm_vs_players_btn.isChecked() in [True, False] 
+def test_display_static_layer_cached_until_resize(qtbot):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    state = GameState()
+    display = DisplayWindow(state)
+    qtbot.addWidget(display)
+    display.resize(600, 800)
+    display.grab()
+    cached = display.static_layer.cacheKey()
+    state.process_shot('Alpha', (0, 0), 'Tester')
+    display.grab()
+    assert display.static_layer.cacheKey() == cached
+    display.resize(700, 900)
+    display.grab()
+    assert display.static_layer.cacheKey() != cached
+
+def test_fire_shot_repaints_dirty_region_only(qtbot, monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    monkeypatch.setattr(QtWidgets.QMessageBox, 'information', lambda *args: None)
+    state = GameState()
+    display = DisplayWindow(state)
+    control = ControlWindow(state, display)
+    qtbot.addWidget(control)
+    display.resize(600, 800)
+    display.grab()
+    state.add_ship('Omega', [(0, 0)], (1, 1), 0)
+    regions = []
+    display.update = lambda *args: regions.append(args)
+    control.name_input.setText('Tester')
+    control.coord_input.setText('B2')
+    control.team_box.setCurrentText('Alpha')
+    qtbot.mouseClick(control.fire_btn, QtCore.Qt.LeftButton)
+    assert len(regions) == 1 and regions[0]
+    bounds = regions[0][0].boundingRect()
+    assert bounds.width() * bounds.height() < display.width() * display.height()
+    cell = display.cell_rect('Omega', (1, 1)).center().toPoint()
+    assert display.grab().toImage().pixelColor(cell).name() == '#ff0000'
@@ -0,0 +1,310 @@
+"""Integer bitmask helpers for the Battleship engine.
+
+Each board cell maps to one bit: ``index = y * size + x``.  A team's ships,
+the shots fired at it, and the resulting hits and misses are each stored as
+a single Python int, so overlap and "already fired" checks are one ``&``.
+"""
+import random
+from functools import lru_cache
+
+
+def cell_index(x, y, size):
+    return y * size + x
+
+
+def cell_bit(x, y, size):
+    return 1 << (y * size + x)
+
+
+def index_to_coord(index, size):
+    return (index % size, index // size)
+
+
+def shape_cells(shape, origin, orientation):
+    # Orientation 0 keeps the offsets as-is, orientation 1 rotates them.
+    ox, oy = origin
+    if orientation == 0:
+        return [(ox + dx, oy + dy) for dx, dy in shape]
+    return [(ox + dy, oy - dx) for dx, dy in shape]
+
+
+@lru_cache(maxsize=None)
+def _placement_mask(shape, origin, orientation, size):
+    mask = 0
+    for x, y in shape_cells(shape, origin, orientation):
+        if not (0 <= x < size and 0 <= y < size):
+            return None
+        mask |= 1 << (y * size + x)
+    return mask
+
+
+def placement_mask(shape, origin, orientation, size):
+    """Return the bitmask covered by a ship, or None if it leaves the board."""
+    return _placement_mask(tuple(shape), tuple(origin), orientation, size)
+
+
+def iter_bits(mask):
+    """Yield the index of every set bit in ``mask``, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def region_mask(x0, y0, x1, y1, size):
+    """Bitmask of the rectangle of cells from (x0, y0) to (x1, y1) inclusive."""
+    row = ((1 << (x1 - x0 + 1)) - 1) << x0
+    mask = 0
+    for y in range(y0, y1 + 1):
+        mask |= row << (y * size)
+    return mask
+
+
+def mask_to_coords(mask, size):
+    return {(i % size, i // size) for i in iter_bits(mask)}
+
+
+class FleetPlacementError(ValueError):
+    """Raised when a fleet cannot be laid out on the board."""
+
+
+@lru_cache(maxsize=None)
+def _placements(shape, size):
+    seen = set()
+    result = []
+    for orientation in (0, 1):
+        for oy in range(size):
+            for ox in range(size):
+                mask = 0
+                for x, y in shape_cells(shape, (ox, oy), orientation):
+                    if not (0 <= x < size and 0 <= y < size):
+                        break
+                    mask |= 1 << (y * size + x)
+                else:
+                    if mask not in seen:
+                        seen.add(mask)
+                        result.append((mask, (ox, oy), orientation))
+    return tuple(result)
+
+
+def placements(shape, size):
+    """Every on-board placement of ``shape`` as ``(mask, origin, orientation)``."""
+    return _placements(tuple(shape), size)
+
+
+def random_fleet(shapes, size, occupied=0, rng=None, max_steps=None):
+    """Pick a random non-overlapping placement for every shape.
+
+    Each ship is drawn uniformly from the placements still legal given the
+    ships already chosen and ``occupied``.  When a ship has no legal spot the
+    search backtracks, and it restarts from scratch with a growing budget
+    when a branch stays stuck.  Returns ``(mask, origin, orientation)`` per
+    shape, in the order given, or raises FleetPlacementError once
+    ``max_steps`` placements and backtracks have been spent in total.
+    """
+    rng = rng or random
+    count = len(shapes)
+    if max_steps is None:
+        max_steps = 20000 + 100 * count
+    free = size * size - occupied.bit_count()
+    if sum(len(shape) for shape in shapes) > free:
+        raise FleetPlacementError(f"Fleet needs more cells than the {free} free on a {size}x{size} board")
+    options = [placements(shape, size) for shape in shapes]
+    for shape, opts in zip(shapes, options):
+        if not opts:
+            raise FleetPlacementError(f"A ship of length {len(shape)} does not fit on a {size}x{size} board")
+    # Place the most constrained ships first
+    order = sorted(range(count), key=lambda i: len(options[i]))
+    ordered = [options[i] for i in order]
+    # Spare cells stay constant as ships go down.  On tight boards, prune any
+    # branch that strands more free cells than the remaining ships can spare.
+    slack = free - sum(len(shape) for shape in shapes)
+    prune = slack < 2 * size
+    full = (1 << (size * size)) - 1
+    suffix = [[] for _ in range(count + 1)]
+    for depth in range(count - 1, -1, -1):
+        suffix[depth] = suffix[depth + 1] if ordered[depth] in suffix[depth + 1] else suffix[depth + 1] + [ordered[depth]]
+    spent = 0
+    budget = 4 * count + 50
+    while spent < max_steps:
+        budget = min(budget, max_steps - spent)
+        chosen, used = _search(ordered, occupied, rng, budget, suffix if prune else None, slack, full)
+        spent += used
+        if chosen is not None:
+            result = [None] * count
+            for depth, pick in enumerate(chosen):
+                result[order[depth]] = pick
+            return result
+        if used < budget:
+            raise FleetPlacementError(f"No legal layout for {count} ships on a {size}x{size} board")
+        budget *= 2
+    raise FleetPlacementError(f"Could not lay out {count} ships on a {size}x{size} board within {max_steps} steps")
+
+
+def _stranded(suffix_options, occupied, full):
+    # Free cells that no remaining ship can cover any more
+    coverable = 0
+    for opts in suffix_options:
+        for mask, _, _ in opts:
+            if not mask & occupied:
+                coverable |= mask
+    return (full & ~occupied & ~coverable).bit_count()
+
+
+def _search(ordered, occupied, rng, budget, suffix=None, slack=0, full=0):
+    # Depth-first search with randomized candidate order.  Returns
+    # (chosen placements, steps used), or (None, steps used) when the
+    # search space is exhausted or the budget runs out.
+    count = len(ordered)
+    chosen = []
+    # Per depth: a list of untried legal placements, or the single mask
+    # tried so far when the ship was placed by sampling.
+    remaining = []
+    steps = 0
+    while len(chosen) < count:
+        if steps >= budget:
+            return None, steps
+        steps += 1
+        depth = len(chosen)
+        opts = ordered[depth]
+        pick = None
+        if depth == len(remaining):
+            # Rejection sampling from all placements is uniform over the legal
+            # ones; fall back to filtering once the board gets crowded.
+            for _ in range(16):
+                candidate = opts[rng.randrange(len(opts))]
+                if not candidate[0] & occupied:
+                    pick = candidate
+                    break
+            if pick is None:
+                legal = [p for p in opts if not p[0] & occupied]
+                rng.shuffle(legal)
+                remaining.append(legal)
+            else:
+                remaining.append(pick[0])
+        elif not isinstance(remaining[depth], list):
+            tried = remaining[depth]
+            legal = [p for p in opts if not p[0] & occupied and p[0] != tried]
+            rng.shuffle(legal)
+            remaining[depth] = legal
+        if pick is None and remaining[depth]:
+            pick = remaining[depth].pop()
+        if pick is None:
+            remaining.pop()
+            if not chosen:
+                return None, steps
+            occupied &= ~chosen.pop()[0]
+            continue
+        if suffix is not None and depth + 1 < count and _stranded(suffix[depth + 1], occupied | pick[0], full) > slack:
+            continue
+        chosen.append(pick)
+        occupied |= pick[0]
+    return chosen, steps
+
+
+class PlacedShip:
+    """One ship on a board, with its cells precomputed and a running hit count."""
+
+    __slots__ = ("ship_id", "shape", "origin", "orientation", "mask", "cells", "hits")
+
+    def __init__(self, ship_id, shape, origin, orientation, mask):
+        self.ship_id = ship_id
+        self.shape = shape
+        self.origin = origin
+        self.orientation = orientation
+        self.mask = mask
+        self.cells = tuple(iter_bits(mask))
+        self.hits = 0
+
+    @property
+    def sunk(self):
+        return self.hits == len(self.cells)
+
+    def as_tuple(self):
+        return (self.shape, self.origin, self.orientation)
+
+
+class TeamBoard:
+    """Bitmask state of one team's board.
+
+    ``ships`` holds the cells occupied by this team's fleet; ``shots``,
+    ``hits`` and ``misses`` hold the cells the opposing team has fired at.
+    ``fleet`` maps ship ids to PlacedShip entries and ``owner`` maps each
+    occupied cell index to the id of the ship covering it.
+    """
+
+    __slots__ = ("size", "ships", "shots", "hits", "misses", "fleet", "owner", "_next_id")
+
+    def __init__(self, size):
+        self.size = size
+        self.ships = 0
+        self.shots = 0
+        self.hits = 0
+        self.misses = 0
+        self.fleet = {}
+        self.owner = {}
+        self._next_id = 0
+
+    def place(self, shape, origin, orientation, mask):
+        # Caller has already checked the mask is on the board and free.
+        ship = PlacedShip(self._next_id, shape, origin, orientation, mask)
+        self._next_id += 1
+        ship.hits = (mask & self.hits).bit_count()
+        self.fleet[ship.ship_id] = ship
+        for index in ship.cells:
+            self.owner[index] = ship.ship_id
+        self.ships |= mask
+        return ship
+
+    def remove(self, ship_id):
+        ship = self.fleet.pop(ship_id)
+        for index in ship.cells:
+            del self.owner[index]
+        self.ships &= ~ship.mask
+        return ship
+
+    def replace(self, ship_id, shape, origin, orientation, mask):
+        # Swap a ship for a new placement, keeping its position in the fleet order
+        order = list(self.fleet)
+        self.remove(ship_id)
+        ship = self.place(shape, origin, orientation, mask)
+        order[order.index(ship_id)] = ship.ship_id
+        self.fleet = {i: self.fleet[i] for i in order}
+        return ship
+
+    def clear_fleet(self):
+        self.fleet.clear()
+        self.owner.clear()
+        self.ships = 0
+
+    def ship_at(self, index):
+        ship_id = self.owner.get(index)
+        return None if ship_id is None else self.fleet[ship_id]
+
+    def afloat(self):
+        return self.ships & ~self.hits
+
+    def is_fired(self, index):
+        return bool(self.shots >> index & 1)
+
+    def fire(self, index):
+        # Caller has already checked is_fired; returns True on a hit.
+        bit = 1 << index
+        self.shots |= bit
+        ship_id = self.owner.get(index)
+        if ship_id is not None:
+            self.hits |= bit
+            self.fleet[ship_id].hits += 1
+            return True
+        self.misses |= bit
+        return False
+
+    def unfire(self, index):
+        bit = 1 << index
+        if self.hits & bit:
+            ship_id = self.owner.get(index)
+            if ship_id is not None:
+                self.fleet[ship_id].hits -= 1
+        self.shots &= ~bit
+        self.hits &= ~bit
+        self.misses &= ~bit
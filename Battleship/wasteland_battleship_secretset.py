@@ -1,8 +1,15 @@
-import sys, random, string, csv
+import sys, math, string, csv
 from PySide6 import QtWidgets, QtGui, QtCore
 from PySide6.QtCore import QCoreApplication
 
+try:
+    from .wasteland_battleship_bitboard import FleetPlacementError, TeamBoard, cell_index, iter_bits, mask_to_coords, placement_mask, random_fleet, region_mask
+except ImportError:  # Run as a script: python Battleship/wasteland_battleship_secretset.py
+    from wasteland_battleship_bitboard import FleetPlacementError, TeamBoard, cell_index, iter_bits, mask_to_coords, placement_mask, random_fleet, region_mask
+
 GRID_SIZE = 8
+MIN_GRID_SIZE = 8
+MAX_GRID_SIZE = 64
 CELL_SIZE = 50
 HIT_COLOR = "red"
 MISS_COLOR = "blue"
@@ -10,6 +17,8 @@ EMPTY_COLOR = "white"
 ALPHA_COLOR = "lightgray"
 OMEGA_COLOR = "lightblue"
 SHIP_COLORS = ["green", "orange", "purple", "yellow", "pink"]
+# Brushes are built once instead of per cell on every paint
+BRUSHES = {color: QtGui.QBrush(QtGui.QColor(color)) for color in (HIT_COLOR, MISS_COLOR, ALPHA_COLOR, OMEGA_COLOR, *SHIP_COLORS)}
 
 # Define ship shapes: (name, list of (x, y) offsets)
 SHIP_SHAPES = [
@@ -20,91 +29,128 @@ SHIP_SHAPES = [
     ("Destroyer (2)", [(0, i) for i in range(2)]),
 ]
 
+def fleet_for_size(grid_size):
+    # One copy of SHIP_SHAPES per 8x8 worth of area keeps ship density constant.
+    # The first len(SHIP_SHAPES) entries always line up with SHIP_SHAPES.
+    copies = max(1, (grid_size * grid_size) // (GRID_SIZE * GRID_SIZE))
+    return SHIP_SHAPES * copies
+
+def column_label(x):
+    # 0 -> A, 25 -> Z, 26 -> AA, 27 -> AB, ...
+    label = ""
+    x += 1
+    while x:
+        x, rem = divmod(x - 1, 26)
+        label = string.ascii_uppercase[rem] + label
+    return label
+
+def coord_to_text(coord):
+    return f"{column_label(coord[0])}{coord[1] + 1}"
+
+def coord_from_text(text, grid_size=GRID_SIZE):
+    # Parses "B4" or "AA12" into (col, row); returns None if invalid or off the board
+    text = text.strip().upper()
+    letters = text.rstrip(string.digits)
+    digits = text[len(letters):]
+    if not letters or not digits or not letters.isalpha() or not letters.isascii():
+        return None
+    col = 0
+    for ch in letters:
+        col = col * 26 + (ord(ch) - ord("A") + 1)
+    col -= 1
+    row = int(digits) - 1
+    if not (0 <= col < grid_size and 0 <= row < grid_size):
+        return None
+    return (col, row)
+
 class GameState:
-    def __init__(self):
-        self.reset()
+    def __init__(self, grid_size=GRID_SIZE):
+        self.reset(grid_size)
         self.alpha_wins = 0
         self.omega_wins = 0
 
-    def reset(self):
-        self.grid_alpha = {(x, y): EMPTY_COLOR for x in range(GRID_SIZE) for y in range(GRID_SIZE)}
-        self.grid_omega = {(x, y): EMPTY_COLOR for x in range(GRID_SIZE) for y in range(GRID_SIZE)}
-        self.hits_alpha = set()
-        self.hits_omega = set()
-        self.ships_alpha = []  # List of (shape, origin, orientation)
-        self.ships_omega = []
+    def reset(self, grid_size=None):
+        # grid_size: new board size, or None to keep the current one
+        if grid_size is not None:
+            if not MIN_GRID_SIZE <= grid_size <= MAX_GRID_SIZE:
+                raise ValueError(f"Board size must be between {MIN_GRID_SIZE} and {MAX_GRID_SIZE}")
+            self.grid_size = grid_size
+            self.fleet = fleet_for_size(grid_size)
+        self.grid_alpha = {(x, y): EMPTY_COLOR for x in range(self.grid_size) for y in range(self.grid_size)}
+        self.grid_omega = {(x, y): EMPTY_COLOR for x in range(self.grid_size) for y in range(self.grid_size)}
+        # Bitmask boards keyed by the team that owns the ships
+        self.boards = {"Alpha": TeamBoard(self.grid_size), "Omega": TeamBoard(self.grid_size)}
         self.shots_log = []
-        self.placed_coords_alpha = set()
-        self.placed_coords_omega = set()
+
+    @property
+    def ships_alpha(self):
+        # List of (shape, origin, orientation)
+        return [ship.as_tuple() for ship in self.boards["Alpha"].fleet.values()]
+
+    @property
+    def ships_omega(self):
+        return [ship.as_tuple() for ship in self.boards["Omega"].fleet.values()]
 
     def get_ship_coords(self, team):
         # Returns set of all ship cells for the team
-        ships = self.ships_alpha if team == "Alpha" else self.ships_omega
-        coords = set()
-        for shape, origin, orientation in ships:
-            for dx, dy in shape:
-                if orientation == 0:
-                    x, y = origin[0] + dx, origin[1] + dy
-                else:
-                    x, y = origin[0] + dy, origin[1] - dx
-                coords.add((x, y))
-        return coords
+        return mask_to_coords(self.boards[team].ships, self.grid_size)
+
+    def ship_at(self, team, coord):
+        # Returns the PlacedShip covering coord, or None
+        return self.boards[team].ship_at(cell_index(coord[0], coord[1], self.grid_size))
+
+    def is_ship_sunk(self, team, coord):
+        ship = self.ship_at(team, coord)
+        return ship is not None and ship.sunk
+
+    def afloat_coords(self, team):
+        return mask_to_coords(self.boards[team].afloat(), self.grid_size)
 
     def can_place_ship(self, team, shape, origin, orientation):
-        coords = set()
-        for dx, dy in shape:
-            if orientation == 0:
-                x, y = origin[0] + dx, origin[1] + dy
-            else:
-                x, y = origin[0] + dy, origin[1] - dx
-            if not (0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE):
-                return False
-            coords.add((x, y))
-        placed = self.get_ship_coords(team)
-        if coords & placed:
+        mask = placement_mask(shape, origin, orientation, self.grid_size)
+        if mask is None:
             return False
-        return True
+        return not (mask & self.boards[team].ships)
 
     def add_ship(self, team, shape, origin, orientation):
-        if self.can_place_ship(team, shape, origin, orientation):
-            if team == "Alpha":
-                self.ships_alpha.append((shape, origin, orientation))
-            else:
-                self.ships_omega.append((shape, origin, orientation))
-            return True
-        return False
+        mask = placement_mask(shape, origin, orientation, self.grid_size)
+        board = self.boards[team]
+        if mask is None or mask & board.ships:
+            return False
+        board.place(shape, origin, orientation, mask)
+        return True
+
+    def remove_ship(self, team, index):
+        # index is the ship's position in ships_alpha / ships_omega
+        fleet = self.boards[team].fleet
+        if not 0 <= index < len(fleet):
+            return False
+        self.boards[team].remove(list(fleet)[index])
+        return True
 
     def remove_ship_at(self, team, coord):
-        ships = self.ships_alpha if team == "Alpha" else self.ships_omega
-        for i, (shape, origin, orientation) in enumerate(ships):
-            for dx, dy in shape:
-                if orientation == 0:
-                    x, y = origin[0] + dx, origin[1] + dy
-                else:
-                    x, y = origin[0] + dy, origin[1] - dx
-                if (x, y) == coord:
-                    del ships[i]
-                    return True
-        return False
+        ship = self.ship_at(team, coord)
+        if ship is None:
+            return False
+        self.boards[team].remove(ship.ship_id)
+        return True
 
     def process_shot(self, team, coord, player):
         x, y = coord
         target_grid = self.grid_omega if team == "Alpha" else self.grid_alpha
-        target_team = "Omega" if team == "Alpha" else "Alpha"
-        target_ships = self.get_ship_coords(target_team)
-        hit_set = self.hits_alpha if team == "Alpha" else self.hits_omega
+        target_board = self.boards["Omega" if team == "Alpha" else "Alpha"]
+        index = cell_index(x, y, self.grid_size)
 
-        if coord in hit_set:
+        if target_board.is_fired(index):
             return None  # already fired
 
-        result = "MISS"
-        if coord in target_ships:
+        if target_board.fire(index):
             target_grid[coord] = HIT_COLOR
             result = "HIT"
         else:
             target_grid[coord] = MISS_COLOR
+            result = "MISS"
 
-        hit_set.add(coord)
         self.shots_log.append((player, team, coord, result))
         return result
 
@@ -112,10 +158,9 @@ class GameState:
         if not self.shots_log:
             return
         player, team, coord, result = self.shots_log.pop()
-        hit_set = self.hits_alpha if team == "Alpha" else self.hits_omega
+        board = self.boards["Omega" if team == "Alpha" else "Alpha"]
         grid = self.grid_omega if team == "Alpha" else self.grid_alpha
-        if coord in hit_set:
-            hit_set.remove(coord)
+        board.unfire(cell_index(coord[0], coord[1], self.grid_size))
         grid[coord] = EMPTY_COLOR
 
     def get_hit_buyers(self):
@@ -137,39 +182,63 @@ class GameState:
                 team_stats[team]["misses"] += 1
         return player_stats, team_stats
 
-    def randomize_ships(self, team, ship_indices=None):
-        # ship_indices: list of indices in SHIP_SHAPES to randomize, or None for all
-        if team == "Alpha":
-            self.ships_alpha = []
-        else:
-            self.ships_omega = []
-        placed = set()
-        indices = ship_indices if ship_indices is not None else list(range(len(SHIP_SHAPES)))
-        for idx in indices:
-            shape = SHIP_SHAPES[idx][1]
-            for attempt in range(100):
-                orientation = random.choice([0, 1])
-                if orientation == 0:
-                    max_x = GRID_SIZE - max(dx for dx, dy in shape)
-                    max_y = GRID_SIZE - max(dy for dx, dy in shape)
-                else:
-                    max_x = GRID_SIZE - max(dy for dx, dy in shape)
-                    max_y = GRID_SIZE - max(dx for dx, dy in shape)
-                origin = (random.randint(0, max_x - 1), random.randint(0, max_y - 1))
-                if self.can_place_ship(team, shape, origin, orientation):
-                    self.add_ship(team, shape, origin, orientation)
-                    break
-        # After randomizing, update placed_coords
-        if team == "Alpha":
-            self.placed_coords_alpha = self.get_ship_coords("Alpha")
+    def randomize_ships(self, team, ship_indices=None, rng=None):
+        # ship_indices: list of indices in self.fleet to randomize, or None for all.
+        # Replaces the team's fleet; raises FleetPlacementError (leaving it untouched)
+        # if the ships cannot all be placed.
+        indices = ship_indices if ship_indices is not None else list(range(len(self.fleet)))
+        shapes = [self.fleet[idx][1] for idx in indices]
+        layout = random_fleet(shapes, self.grid_size, rng=rng)
+        board = self.boards[team]
+        board.clear_fleet()
+        for shape, (mask, origin, orientation) in zip(shapes, layout):
+            board.place(shape, origin, orientation, mask)
+
+    def randomize_ship(self, team, index, rng=None):
+        # Moves ship `index` (position in ships_alpha / ships_omega) to a random legal
+        # spot around the rest of the fleet, or adds self.fleet[index] if there is none.
+        board = self.boards[team]
+        ids = list(board.fleet)
+        old = board.fleet[ids[index]] if index < len(ids) else None
+        shape = self.fleet[index][1]
+        occupied = board.ships & ~old.mask if old else board.ships
+        [(mask, origin, orientation)] = random_fleet([shape], self.grid_size, occupied, rng)
+        if old:
+            board.replace(old.ship_id, shape, origin, orientation, mask)
         else:
-            self.placed_coords_omega = self.get_ship_coords("Omega")
+            board.place(shape, origin, orientation, mask)
+
+def label_point_size(cell_size):
+    # 14pt on the classic 8x8 board, shrinking so AA..BL labels fit on big boards
+    return max(6, min(14, int(cell_size * 0.45)))
+
+def grid_lines(left, top, cell_size, size):
+    side = cell_size * size
+    lines = []
+    for i in range(size + 1):
+        offset = i * cell_size
+        lines.append(QtCore.QLineF(left + offset, top, left + offset, top + side))
+        lines.append(QtCore.QLineF(left, top + offset, left + side, top + offset))
+    return lines
+
+def ship_rect(ship, size, cell_size):
+    # Bounding rect of a ship, or None if its cells don't fill the rect exactly
+    first, last = ship.cells[0], ship.cells[-1]
+    x0, y0 = first % size, first // size
+    x1, y1 = last % size, last // size
+    if x1 < x0 or (x1 - x0 + 1) * (y1 - y0 + 1) != len(ship.cells):
+        return None
+    return QtCore.QRectF(x0 * cell_size, y0 * cell_size, (x1 - x0 + 1) * cell_size, (y1 - y0 + 1) * cell_size)
 
 class DisplayWindow(QtWidgets.QWidget):
     def __init__(self, game_state):
         super().__init__()
         self.setWindowTitle("Wasteland Grid Display")
         self.game_state = game_state
+        # Labels and empty boards are cached in a pixmap rebuilt only on resize
+        # or board size change; shots repaint just the cells they touch.
+        self.static_layer = None
+        self.static_key = None
         # Remove setMinimumSize for full responsiveness
         self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
         self.show()
@@ -178,79 +247,127 @@ class DisplayWindow(QtWidgets.QWidget):
         self.update()
         super().resizeEvent(event)
 
-    def paintEvent(self, event):
-        painter = QtGui.QPainter(self)
-        width = self.width()
-        height = self.height()
+    def layout_boards(self):
+        # Recomputes board geometry and the static pixmap when the size changes
+        size = self.game_state.grid_size
+        key = (self.width(), self.height(), size, self.devicePixelRatioF())
+        if key == self.static_key:
+            return
+        width, height = self.width(), self.height()
         grid_width = width - 60
         grid_height = (height - 120) // 2
-        cell_size_x = grid_width / GRID_SIZE
-        cell_size_y = grid_height / GRID_SIZE
-        cell_size = min(cell_size_x, cell_size_y)
-        font = painter.font()
-        font.setBold(True)
-        font.setPointSize(14)
-        painter.setFont(font)
-        # Draw Alpha grid
-        offset_y_alpha = 30
-        # Draw column letters centered
-        for x in range(GRID_SIZE):
-            rect = QtCore.QRectF(40 + x * cell_size, offset_y_alpha - 24, cell_size, 20)
-            painter.drawText(rect, QtCore.Qt.AlignHCenter | QtCore.Qt.AlignVCenter, string.ascii_uppercase[x])
-        # Draw row numbers (fixed)
-        for y in range(GRID_SIZE):
-            rect = QtCore.QRectF(0, offset_y_alpha + y * cell_size, 38, cell_size)
-            painter.drawText(rect, QtCore.Qt.AlignVCenter | QtCore.Qt.AlignRight, str(y + 1))
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                color = self.game_state.grid_alpha[(x, y)]
-                display_color = ALPHA_COLOR if color == EMPTY_COLOR else color
-                rect = QtCore.QRectF(40 + x * cell_size, offset_y_alpha + y * cell_size, cell_size, cell_size)
-                painter.fillRect(rect, QtGui.QColor(display_color))
-                painter.drawRect(rect)
-        # Draw Omega grid
-        offset_y_omega = grid_height + 70
-        font.setPointSize(14)
-        painter.setFont(font)
-        for x in range(GRID_SIZE):
-            rect = QtCore.QRectF(40 + x * cell_size, offset_y_omega - 24, cell_size, 20)
-            painter.drawText(rect, QtCore.Qt.AlignHCenter | QtCore.Qt.AlignVCenter, string.ascii_uppercase[x])
-        for y in range(GRID_SIZE):
-            rect = QtCore.QRectF(0, offset_y_omega + y * cell_size, 38, cell_size)
-            painter.drawText(rect, QtCore.Qt.AlignVCenter | QtCore.Qt.AlignRight, str(y + 1))
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                color = self.game_state.grid_omega[(x, y)]
-                display_color = OMEGA_COLOR if color == EMPTY_COLOR else color
-                rect = QtCore.QRectF(40 + x * cell_size, offset_y_omega + y * cell_size, cell_size, cell_size)
-                painter.fillRect(rect, QtGui.QColor(display_color))
-                painter.drawRect(rect)
-        # Draw log line exactly between the two grids
+        cell_size = max(1.0, min(grid_width / size, grid_height / size))
+        self.cell_size = cell_size
+        self.board_tops = {"Alpha": 30, "Omega": grid_height + 70}
+        self.board_lines = {team: grid_lines(40, top, cell_size, size) for team, top in self.board_tops.items()}
+        self.label_font = QtGui.QFont(self.font())
+        self.label_font.setBold(True)
+        self.label_font.setPointSize(label_point_size(cell_size))
+        # Log line sits exactly between the two grids
+        bottom_alpha = self.board_tops["Alpha"] + cell_size * size
+        top_omega = self.board_tops["Omega"] - 24  # top of Omega grid's column labels
+        available_space = top_omega - bottom_alpha
+        self.log_font = None
+        self.log_rect = QtCore.QRectF()
+        if available_space > 10:
+            self.log_font = QtGui.QFont(self.label_font)
+            self.log_font.setPointSize(min(18, max(10, int(available_space * 0.5))))
+            y_log = bottom_alpha + (available_space / 2) - 10
+            self.log_rect = QtCore.QRectF(0, y_log, width, available_space)
+        # HIT / MISS banner centered in the Omega grid
+        self.banner_font = QtGui.QFont(self.label_font)
+        self.banner_font.setPointSize(48)
+        self.omega_rect = QtCore.QRectF(40, self.board_tops["Omega"], cell_size * size, cell_size * size)
+        metrics = QtGui.QFontMetricsF(self.banner_font)
+        banner_size = QtCore.QSizeF(metrics.horizontalAdvance("MISS") + 8, metrics.height() + 8)
+        self.banner_rect = QtCore.QRectF(QtCore.QPointF(0, 0), banner_size)
+        self.banner_rect.moveCenter(self.omega_rect.center())
+
+        dpr = self.devicePixelRatioF()
+        pixmap = QtGui.QPixmap(max(1, int(width * dpr)), max(1, int(height * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(self.palette().color(QtGui.QPalette.Window))
+        painter = QtGui.QPainter(pixmap)
+        painter.setFont(self.label_font)
+        for team, empty in (("Alpha", ALPHA_COLOR), ("Omega", OMEGA_COLOR)):
+            top = self.board_tops[team]
+            self.draw_labels(painter, top, cell_size)
+            painter.fillRect(QtCore.QRectF(40, top, cell_size * size, cell_size * size), BRUSHES[empty])
+            painter.drawLines(self.board_lines[team])
+        painter.end()
+        self.static_layer = pixmap
+        self.static_key = key
+
+    def cell_rect(self, team, coord):
+        top = self.board_tops[team]
+        return QtCore.QRectF(40 + coord[0] * self.cell_size, top + coord[1] * self.cell_size, self.cell_size, self.cell_size)
+
+    def update_shot(self, team, coord):
+        # Repaints only the target cell, the log line and the HIT/MISS banner
+        if self.static_key is None:
+            self.update()
+            return
+        target = "Omega" if team == "Alpha" else "Alpha"
+        region = QtGui.QRegion(self.cell_rect(target, coord).toAlignedRect().adjusted(-1, -1, 1, 1))
+        region = region.united(QtGui.QRegion(self.log_rect.toAlignedRect()))
+        region = region.united(QtGui.QRegion(self.banner_rect.toAlignedRect()))
+        self.update(region)
+
+    def paintEvent(self, event):
+        self.layout_boards()
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(0, 0, self.static_layer)
+        dirty = QtCore.QRectF(event.rect())
+        for team in ("Alpha", "Omega"):
+            self.paint_marks(painter, team, dirty)
+        painter.setPen(QtGui.QColor("black"))
         if self.game_state.shots_log:
             player, team, coord, result = self.game_state.shots_log[-1]
-            coord_str = f"{string.ascii_uppercase[coord[0]]}{coord[1]+1}"
-            log_line = f"{player} ({team}) fired at {coord_str}: {result}"
-            # Calculate the space between the bottom of Alpha and top of Omega grid
-            bottom_alpha = offset_y_alpha + cell_size * GRID_SIZE
-            top_omega = offset_y_omega - 24  # top of Omega grid's column labels
-            available_space = top_omega - bottom_alpha
-            if available_space > 10:
-                font.setPointSize(min(18, max(10, int(available_space * 0.5))))
-                painter.setFont(font)
+            if self.log_font is not None and dirty.intersects(self.log_rect):
+                coord_str = coord_to_text(coord)
+                log_line = f"{player} ({team}) fired at {coord_str}: {result}"
+                painter.setFont(self.log_font)
+                painter.drawText(self.log_rect, QtCore.Qt.AlignHCenter | QtCore.Qt.AlignVCenter, log_line)
+            # Show HIT or MISS text only in the center of the Omega grid
+            if (result == "HIT" or result == "MISS") and dirty.intersects(self.banner_rect):
+                painter.setFont(self.banner_font)
+                painter.setPen(BRUSHES[HIT_COLOR].color() if result == "HIT" else BRUSHES[MISS_COLOR].color())
+                painter.drawText(self.omega_rect, QtCore.Qt.AlignCenter, result)
                 painter.setPen(QtGui.QColor("black"))
-                y_log = bottom_alpha + (available_space / 2) - 10
-                painter.drawText(QtCore.QRectF(0, y_log, width, available_space), QtCore.Qt.AlignHCenter | QtCore.Qt.AlignVCenter, log_line)
-        # Show HIT or MISS text only in the center of the Omega grid
-        if self.game_state.shots_log:
-            _, _, _, result = self.game_state.shots_log[-1]
-            if result == "HIT" or result == "MISS":
-                font.setPointSize(48)
-                painter.setFont(font)
-                painter.setPen(QtGui.QColor("red" if result == "HIT" else "blue"))
-                # Center in Omega grid
-                omega_grid_rect = QtCore.QRectF(40, offset_y_omega, cell_size * GRID_SIZE, cell_size * GRID_SIZE)
-                painter.drawText(omega_grid_rect, QtCore.Qt.AlignCenter, result)
-        painter.setPen(QtGui.QColor("black"))
+
+    def paint_marks(self, painter, team, dirty):
+        # Fills only the fired-at cells inside the dirty rect, then redraws the grid lines.
+        # Cost scales with the number of shots in view, not with the number of board cells.
+        size = self.game_state.grid_size
+        cell_size = self.cell_size
+        top = self.board_tops[team]
+        x0 = max(0, int((dirty.left() - 40) // cell_size))
+        y0 = max(0, int((dirty.top() - top) // cell_size))
+        x1 = min(size - 1, int((dirty.right() - 40) // cell_size))
+        y1 = min(size - 1, int((dirty.bottom() - top) // cell_size))
+        if x0 > x1 or y0 > y1:
+            return
+        board = self.game_state.boards[team]
+        view = region_mask(x0, y0, x1, y1, size)
+        for mask, brush in ((board.hits & view, BRUSHES[HIT_COLOR]), (board.misses & view, BRUSHES[MISS_COLOR])):
+            for index in iter_bits(mask):
+                x, y = index % size, index // size
+                painter.fillRect(QtCore.QRectF(40 + x * cell_size, top + y * cell_size, cell_size, cell_size), brush)
+        painter.drawLines(self.board_lines[team])
+
+    def draw_labels(self, painter, offset_y, cell_size):
+        # Column letters centered above the grid, row numbers to the left
+        # On big boards only every step-th label is drawn so they don't overlap
+        size = self.game_state.grid_size
+        metrics = painter.fontMetrics()
+        col_step = max(1, math.ceil((metrics.horizontalAdvance(column_label(size - 1)) + 2) / cell_size))
+        row_step = max(1, math.ceil(metrics.height() / cell_size))
+        for x in range(0, size, col_step):
+            rect = QtCore.QRectF(40 + x * cell_size, offset_y - 24, cell_size, 20)
+            painter.drawText(rect, QtCore.Qt.AlignHCenter | QtCore.Qt.AlignVCenter | QtCore.Qt.TextDontClip, column_label(x))
+        for y in range(0, size, row_step):
+            rect = QtCore.QRectF(0, offset_y + y * cell_size, 38, cell_size)
+            painter.drawText(rect, QtCore.Qt.AlignVCenter | QtCore.Qt.AlignRight, str(y + 1))
 
 class ShipPlacementGrid(QtWidgets.QWidget):
     def __init__(self, game_state, team, update_callback, get_selected_ship, get_orientation, control_window=None, hide_ships=True):
@@ -271,13 +388,14 @@ class ShipPlacementGrid(QtWidgets.QWidget):
 
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
+        size = self.game_state.grid_size
         width = self.width()
         height = self.height()
-        cell_size_x = width / GRID_SIZE
-        cell_size_y = height / GRID_SIZE
+        cell_size_x = width / size
+        cell_size_y = height / size
         cell_size = min(cell_size_x, cell_size_y)
         color_base = ALPHA_COLOR if self.team == "Alpha" else OMEGA_COLOR
-        ships = self.game_state.ships_alpha if self.team == "Alpha" else self.game_state.ships_omega
+        board = self.game_state.boards[self.team]
         # GM vs Players mode: show ships only on GM's grid, hide on opponent's
         show_ships = True
         if self.control_window and getattr(self.control_window, 'gm_vs_players_mode', False):
@@ -287,33 +405,32 @@ class ShipPlacementGrid(QtWidgets.QWidget):
             else:
                 show_ships = False
         if show_ships:
-            for x in range(GRID_SIZE):
-                for y in range(GRID_SIZE):
-                    rect = QtCore.QRectF(x * cell_size, y * cell_size, cell_size, cell_size)
-                    painter.fillRect(rect, QtGui.QColor(color_base))
-                    painter.drawRect(rect)
-            for idx, (shape, origin, orientation) in enumerate(ships):
-                color = SHIP_COLORS[idx % len(SHIP_COLORS)]
-                for dx, dy in shape:
-                    if orientation == 0:
-                        x, y = origin[0] + dx, origin[1] + dy
-                    else:
-                        x, y = origin[0] + dy, origin[1] - dx
-                    if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE:
-                        rect = QtCore.QRectF(x * cell_size, y * cell_size, cell_size, cell_size)
-                        painter.fillRect(rect, QtGui.QColor(color))
-                        painter.drawRect(rect)
+            painter.fillRect(QtCore.QRectF(0, 0, cell_size * size, cell_size * size), BRUSHES[color_base])
+            for idx, ship in enumerate(board.fleet.values()):
+                color = BRUSHES[SHIP_COLORS[idx % len(SHIP_COLORS)]]
+                rect = ship_rect(ship, size, cell_size)
+                if rect is not None:
+                    painter.fillRect(rect, color)
+                    continue
+                for index in ship.cells:
+                    x, y = index % size, index // size
+                    painter.fillRect(QtCore.QRectF(x * cell_size, y * cell_size, cell_size, cell_size), color)
+            painter.drawLines(grid_lines(0, 0, cell_size, size))
 
     def mousePressEvent(self, event):
+        size = self.game_state.grid_size
         width = self.width()
         height = self.height()
-        cell_size_x = width // GRID_SIZE
-        cell_size_y = height // GRID_SIZE
+        cell_size_x = width / size
+        cell_size_y = height / size
         cell_size = min(cell_size_x, cell_size_y)
-        x = event.x() // cell_size
-        y = event.y() // cell_size
-        if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE:
+        if cell_size <= 0:
+            return
+        x = int(event.position().x() // cell_size)
+        y = int(event.position().y() // cell_size)
+        if 0 <= x < size and 0 <= y < size:
             coord = (x, y)
+            # Clicking an existing ship removes it (cell-to-ship index lookup)
             if self.game_state.remove_ship_at(self.team, coord):
                 self.update()
                 self.update_callback()
@@ -493,6 +610,14 @@ class ControlWindow(QtWidgets.QWidget):
         self.stats_btn.clicked.connect(self.toggle_stats)
         self.leaderboard_btn = QtWidgets.QPushButton("Show Leaderboard")
         self.leaderboard_btn.clicked.connect(self.toggle_leaderboard)
+        self.board_size_box = QtWidgets.QSpinBox()
+        self.board_size_box.setRange(MIN_GRID_SIZE, MAX_GRID_SIZE)
+        self.board_size_box.setValue(self.game_state.grid_size)
+        self.board_size_box.setPrefix("Board: ")
+        self.board_size_box.setToolTip("Board size (NxN). Changing it starts a new game.")
+        self.board_size_box.setKeyboardTracking(False)
+        self.board_size_box.valueChanged.connect(self.apply_board_size)
+        game_layout.addWidget(self.board_size_box)
         game_layout.addWidget(self.save_log_btn)
         game_layout.addWidget(self.export_hit_btn)
         game_layout.addWidget(self.alpha_win_btn)
@@ -657,14 +782,7 @@ class ControlWindow(QtWidgets.QWidget):
         self.win_label.setText(f"A: {self.game_state.alpha_wins} | O: {self.game_state.omega_wins}")
 
     def coord_from_text(self, text):
-        try:
-            col = string.ascii_uppercase.index(text[0])
-            row = int(text[1:]) - 1
-            if not (0 <= col < GRID_SIZE and 0 <= row < GRID_SIZE):
-                raise ValueError
-            return (col, row)
-        except:
-            return None
+        return coord_from_text(text, self.game_state.grid_size)
 
     def place_ship_text(self):
         origin_text = self.ship_entry.text().strip().upper()
@@ -698,7 +816,7 @@ class ControlWindow(QtWidgets.QWidget):
 
         result = self.game_state.process_shot(team, coord, player)
         if result:
-            self.display_window.update()
+            self.display_window.update_shot(team, coord)
             self.log_box.append(f"{player} ({team}) fired at {coord_text}: {result}")
             if result == "HIT":
                 QtWidgets.QMessageBox.information(self, "HIT!", f"{player} scored a HIT!\nAssign a Wasteland reward manually.")
@@ -710,14 +828,29 @@ class ControlWindow(QtWidgets.QWidget):
             self.log_box.append("Coordinate already targeted.")
 
     def undo_shot(self):
-        self.game_state.undo_shot()
-        self.display_window.update()
+        if self.game_state.shots_log:
+            _, team, coord, _ = self.game_state.shots_log[-1]
+            self.game_state.undo_shot()
+            self.display_window.update_shot(team, coord)
         self.log_box.append("Last shot undone.")
         if self.stats_panel:
             self.stats_panel.update_stats()
         if self.leaderboard_panel:
             self.leaderboard_panel.update_leaderboard()
 
+    def apply_board_size(self):
+        size = self.board_size_box.value()
+        if size == self.game_state.grid_size:
+            return
+        self.game_state.reset(size)
+        self.display_window.update()
+        self.log_box.append(f"Board resized to {size}x{size} ({len(self.game_state.fleet)} ships per team). Place ships to begin.")
+        self.update_grids()
+        if self.stats_panel:
+            self.stats_panel.update_stats()
+        if self.leaderboard_panel:
+            self.leaderboard_panel.update_leaderboard()
+
     def reset_game(self):
         self.game_state.reset()
         self.display_window.update()
@@ -736,7 +869,7 @@ class ControlWindow(QtWidgets.QWidget):
                 writer = csv.writer(f)
                 writer.writerow(["Player", "Team", "Coordinate", "Result"])
                 for player, team, coord, result in self.game_state.shots_log:
-                    coord_str = f"{string.ascii_uppercase[coord[0]]}{coord[1]+1}"
+                    coord_str = coord_to_text(coord)
                     writer.writerow([player, team, coord_str, result])
             self.log_box.append(f"Log saved to {path}")
 
@@ -747,7 +880,7 @@ class ControlWindow(QtWidgets.QWidget):
                 writer = csv.writer(f)
                 writer.writerow(["Player", "Team", "Coordinate"])
                 for player, team, coord in self.game_state.get_hit_buyers():
-                    coord_str = f"{string.ascii_uppercase[coord[0]]}{coord[1]+1}"
+                    coord_str = coord_to_text(coord)
                     writer.writerow([player, team, coord_str])
             self.log_box.append(f"HIT buyers exported to {path}")
 
@@ -786,24 +919,33 @@ class ControlWindow(QtWidgets.QWidget):
             self.leaderboard_panel.show()
 
     def randomize_all_ships(self):
-        self.game_state.randomize_ships("Alpha")
-        self.game_state.randomize_ships("Omega")
+        try:
+            self.game_state.randomize_ships("Alpha")
+            self.game_state.randomize_ships("Omega")
+        except FleetPlacementError as e:
+            self.update_grids()
+            self.log_box.append(f"Randomize failed: {e}")
+            return
         self.update_grids()
         self.log_box.append("All ships randomized for both teams.")
 
     def randomize_team(self, team):
-        self.game_state.randomize_ships(team)
+        try:
+            self.game_state.randomize_ships(team)
+        except FleetPlacementError as e:
+            self.log_box.append(f"Randomize failed: {e}")
+            return
         self.update_grids()
         self.log_box.append(f"All ships randomized for {team}.")
 
     def randomize_selected_ship(self):
         team = self.ship_team.currentText()
         idx = self.ship_select.currentIndex()
-        # Remove the selected ship from the team first
-        ships = self.game_state.ships_alpha if team == "Alpha" else self.game_state.ships_omega
-        if idx < len(ships):
-            del ships[idx]
-        self.game_state.randomize_ships(team, [idx])
+        try:
+            self.game_state.randomize_ship(team, idx)
+        except FleetPlacementError as e:
+            self.log_box.append(f"Randomize failed: {e}")
+            return
         self.update_grids()
         self.log_box.append(f"Randomized {self.ship_select.currentText()} for {team}.")
 